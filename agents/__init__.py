@@ -2,8 +2,47 @@
 Agents package for DBT MCP Server
 
 Contains MCP client and related utilities for connecting to DBT MCP Server.
+
+Public names are resolved lazily (PEP 562), so ``import agents`` does not
+pull in the MCP SDK or LangChain until one of them is first accessed.
 """
 
-from .mcp_client import DBTMCPClient, get_mcp_client, close_global_client
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
+    "DBTMCPClient": ".mcp_client",
+    "get_mcp_client": ".mcp_client",
+    "close_global_client": ".mcp_client",
+    "get_cached_tools": ".mcp_client",
+    "invalidate_tools_cache": ".mcp_client",
+    "invalidate_tool_results": ".mcp_client",
+    "submit": ".mcp_client",
+    "run_sync": ".mcp_client",
+    "run_all": ".mcp_client",
+    "AnswerCache": ".answer_cache",
+    "MCP_CONNECT_TIMEOUT": ".agent",
+    "get_agent": ".agent",
+    "ask_agent": ".agent",
+    "ask_agent_stream": ".agent",
+    "get_cached_answer": ".agent",
+    "clear_answer_cache": ".agent",
+    "warm_answers": ".agent",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str):
+    """Import the submodule defining ``name`` on first access"""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["DBTMCPClient", "get_mcp_client", "close_global_client"]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -12,18 +12,64 @@ Architecture:
 """
 
 import os
-import asyncio
-from typing import Dict, Any, List
+import json
+import functools
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple, Type
 from dotenv import load_dotenv
+from pydantic import BaseModel, Field, create_model
 
-from langchain_openai import ChatOpenAI
-from langgraph.prebuilt import create_react_agent
+from langchain_core.messages import AIMessageChunk, SystemMessage
 from langchain_core.tools import StructuredTool
 
-from agents.mcp_client import get_mcp_client, close_global_client
+from agents.mcp_client import (
+    get_mcp_client,
+    close_global_client,
+    get_cached_tools,
+    get_cached_tool_result,
+    cache_tool_result,
+    run_all,
+    run_sync,
+)
+from agents.answer_cache import AnswerCache
 
-# Load environment variables from .env file
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+
+# OpenAI chat model used by the agent
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# Maximum time to wait for a single MCP tool call (seconds)
+MCP_TOOL_TIMEOUT = 120
+
+# Maximum time to wait for the MCP Server to start and list its tools
+# (seconds); the first uvx launch may have to resolve packages
+MCP_CONNECT_TIMEOUT = 120
+
+# Only MCP tools whose names start with one of these are exposed to the agent;
+# execution tools (run, build, show, execute_sql, ...) are left out. "list"
+# has no underscore so dbt's own `list` command is kept.
+ALLOWED_TOOL_PREFIXES = ("get_", "list", "search_", "describe_", "discovery_")
+
+# Longest tool result handed to the LLM in one piece (characters)
+MAX_TOOL_RESULT_CHARS = 8000
+
+# Number of oversized tool results kept for get_more_results
+MAX_STORED_RESULTS = 32
+
+# Limits for sub-calls dispatched by the batch_execute tool
+BATCH_MAX_CONCURRENT = 8
+BATCH_CALL_TIMEOUT = 60
+
+
+# Routes requests sharing the static prompt prefix to the same OpenAI prompt cache.
+# OpenAI only caches prefixes of 1024+ tokens; the system prompt plus the tool
+# schemas clear that, so no padding is needed.
+PROMPT_CACHE_KEY = "dbt-data-discovery-agent"
 
 
 # System prompt for the agent
@@ -39,6 +85,10 @@ Response requirements:
 - If uncertain, ask for more information
 - Keep responses concise and highlight key information
 - Focus on discovery - execution tools are disabled for safety
+- When several independent lookups are needed, make them in a single
+  `batch_execute` call instead of calling the tools one at a time
+- Long tool results are split into pages; only call `get_more_results`
+  when the remaining content is needed to answer the question
 
 You have access to DBT metadata tools. Use them to answer questions about:
 - Available tables and models
@@ -47,11 +97,231 @@ You have access to DBT metadata tools. Use them to answer questions about:
 - Documentation and descriptions
 """
 
+# Built once so the cached prompt prefix is byte-identical on every turn.
+# Keep per-request data out of it; tool results follow the prefix uncached.
+SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
+
+def _extract_text(result: Any) -> str:
+    """Extract the text content from an MCP tool result"""
+    if result.content:
+        return result.content[0].text
+    return str(result)
+
+
+# Full text of oversized tool results, keyed by result id
+_stored_results: "OrderedDict[str, str]" = OrderedDict()
+_stored_results_lock = threading.Lock()
+
+
+def _paginate(text: str, result_id: Optional[str] = None, offset: int = 0) -> str:
+    """
+    Return one page of a tool result
+
+    Results longer than MAX_TOOL_RESULT_CHARS are stored and truncated,
+    with a cursor the agent can pass to get_more_results to continue.
+
+    Args:
+        text: Full tool result text
+        result_id: Id of an already stored result
+        offset: Character offset of the page to return
+
+    Returns:
+        str: The requested page, plus a continuation pointer if more remains
+    """
+    end = offset + MAX_TOOL_RESULT_CHARS
+
+    if offset == 0 and len(text) <= MAX_TOOL_RESULT_CHARS:
+        return text
+
+    if result_id is None:
+        result_id = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+        with _stored_results_lock:
+            _stored_results[result_id] = text
+            _stored_results.move_to_end(result_id)
+            while len(_stored_results) > MAX_STORED_RESULTS:
+                _stored_results.popitem(last=False)
+
+    page = text[offset:end]
+    if end < len(text):
+        page += (
+            f"\n\n[Truncated: {len(text) - end} more characters. "
+            f'Call get_more_results(cursor="{result_id}:{end}") to continue.]'
+        )
+
+    return page
+
+
+def create_get_more_results_tool() -> StructuredTool:
+    """
+    Create a LangChain tool that returns further pages of truncated results
+
+    Returns:
+        StructuredTool: LangChain tool named ``get_more_results``
+    """
+
+    def get_more_results(cursor: str) -> str:
+        """Return the next page of a truncated tool result"""
+        result_id, _, offset = cursor.partition(":")
+
+        with _stored_results_lock:
+            text = _stored_results.get(result_id)
+
+        if text is None or not offset.isdigit():
+            return f"Error: unknown or expired cursor {cursor!r}"
+
+        return _paginate(text, result_id=result_id, offset=int(offset))
+
+    return StructuredTool.from_function(
+        func=get_more_results,
+        name="get_more_results",
+        description=(
+            "Continue reading a tool result that was truncated. "
+            "Pass the `cursor` value given at the end of the truncated result."
+        ),
+    )
+
+
+async def _call_tool_text(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """
+    Call an MCP tool and return its text result
+
+    Raises:
+        RuntimeError: If the tool reports an error
+    """
+    client = await get_mcp_client()
+    result = await client.call_tool(tool_name, arguments)
+    if getattr(result, "isError", False):
+        raise RuntimeError(_extract_text(result))
+    return _extract_text(result)
+
+
+def _cached_call(tool_name: str, args_json: str) -> str:
+    """
+    Call an MCP tool, serving repeats from the tool result cache
+
+    Keyed on the tool name and canonical (sorted-key) JSON arguments.
+    Failures raise and are therefore never cached.
+    """
+    cached = get_cached_tool_result(tool_name, args_json)
+    if cached is not None:
+        return cached
+
+    # Run on the shared MCP event loop so the session stays warm
+    text = run_sync(_call_tool_text(tool_name, json.loads(args_json)), timeout=MCP_TOOL_TIMEOUT)
+    cache_tool_result(tool_name, args_json, text)
+    return text
+
+
+# JSON schema primitive types -> Python types for tool argument models
+_JSON_SCHEMA_TYPES: Dict[str, Any] = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "object": Dict[str, Any],
+}
+
+
+def _json_schema_type(prop: Dict[str, Any]) -> Any:
+    """Map a JSON schema property to a Python type annotation"""
+    prop_type = prop.get("type")
+
+    if isinstance(prop_type, list):
+        non_null = [t for t in prop_type if t != "null"]
+        inner = _json_schema_type({**prop, "type": non_null[0]}) if len(non_null) == 1 else Any
+        return Optional[inner] if "null" in prop_type else inner
+
+    if prop_type == "array":
+        return List[_json_schema_type(prop.get("items") or {})]
+
+    return _JSON_SCHEMA_TYPES.get(prop_type, Any)
+
+
+@functools.lru_cache(maxsize=256)
+def _build_args_schema(schema_json: str) -> Optional[Type[BaseModel]]:
+    """
+    Compile an MCP tool inputSchema into a Pydantic model
+
+    Memoized on the canonical schema JSON, so each distinct schema is
+    compiled once and LangChain validates arguments against a ready model.
+
+    Args:
+        schema_json: Tool inputSchema serialized with sorted keys
+
+    Returns:
+        Pydantic model for the tool arguments, or None if the schema has
+        property names that cannot be used as model fields
+    """
+    schema = json.loads(schema_json)
+    properties = schema.get("properties") or {}
+    required = set(schema.get("required") or [])
+
+    fields: Dict[str, Any] = {}
+    for name, prop in properties.items():
+        if not name.isidentifier() or name.startswith("_") or hasattr(BaseModel, name):
+            return None
+
+        prop = prop if isinstance(prop, dict) else {}
+        annotation = _json_schema_type(prop)
+        description = prop.get("description")
+
+        if name in required:
+            fields[name] = (annotation, Field(..., description=description))
+        else:
+            fields[name] = (
+                Optional[annotation],
+                Field(default=prop.get("default"), description=description)
+            )
+
+    return create_model("MCPToolArgs", **fields)
+
+
+def _args_json(arguments: Dict[str, Any]) -> str:
+    """Serialize tool arguments canonically, as the tool result cache key"""
+    # Unset optional arguments are left for the server to default
+    arguments = {key: value for key, value in arguments.items() if value is not None}
+    return json.dumps(arguments, sort_keys=True, default=str)
+
+
+def _validated_args_json(tool: StructuredTool, arguments: Dict[str, Any]) -> str:
+    """
+    Validate raw tool arguments against the tool's schema and serialize them
+
+    Applies the same validation LangChain runs before a direct tool call,
+    keeping only the passed arguments that are declared fields. Tools
+    without a compiled model (see create_mcp_tool_wrapper) get their
+    arguments passed through unchanged, as on the direct path.
+
+    Raises:
+        ValueError: If the arguments do not match the schema
+    """
+    if not isinstance(arguments, dict):
+        raise ValueError("args must be an object")
+
+    model = tool.args_schema
+    if isinstance(model, type) and issubclass(model, BaseModel):
+        validated = model.model_validate(arguments)
+        arguments = {
+            key: getattr(validated, key)
+            for key in arguments
+            if key in model.model_fields
+        }
+
+    return _args_json(arguments)
+
+
+# Tool wrappers keyed by (tool name, hash of description + schema)
+_tool_wrappers: Dict[Tuple[str, str], StructuredTool] = {}
+
 
 def create_mcp_tool_wrapper(tool_name: str, tool_description: str, tool_schema: dict = None):
     """
     Create a LangChain tool wrapper for an MCP tool
 
+    Wrappers are reused for as long as the tool's description and schema
+    are unchanged.
+
     Args:
         tool_name: Name of the MCP tool
         tool_description: Description of what the tool does
@@ -60,119 +330,260 @@ def create_mcp_tool_wrapper(tool_name: str, tool_description: str, tool_schema:
     Returns:
         StructuredTool: LangChain tool that calls the MCP tool
     """
+    schema_hash = hashlib.sha256(
+        json.dumps([tool_description, tool_schema], sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    cache_key = (tool_name, schema_hash)
 
-    def sync_call_mcp_tool(**kwargs) -> str:
-        """Synchronous wrapper that calls MCP tool"""
-        async def _call():
-            client = await get_mcp_client()
-            result = await client.call_tool(tool_name, kwargs)
+    if cache_key in _tool_wrappers:
+        return _tool_wrappers[cache_key]
+
+    args_schema = None
+    if tool_schema:
+        args_schema = _build_args_schema(json.dumps(tool_schema, sort_keys=True, default=str))
 
-            # Extract text content from result
-            if result.content:
-                return result.content[0].text
-            return str(result)
+    # Without a compiled model, give LangChain the raw JSON schema: the LLM
+    # still sees the real parameters and arguments are passed through as-is
+    if args_schema is None:
+        args_schema = tool_schema or {"type": "object", "properties": {}}
 
-        # Run async function synchronously
+    def sync_call_mcp_tool(**kwargs) -> str:
+        """Synchronous wrapper that calls MCP tool"""
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_closed():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            elif loop.is_running():
-                # Create new loop for nested async call
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-            return loop.run_until_complete(_call())
+            return _paginate(_cached_call(tool_name, _args_json(kwargs)))
         except Exception as e:
             return f"Error calling MCP tool '{tool_name}': {str(e)}"
 
     # Create the LangChain tool
-    return StructuredTool.from_function(
+    langchain_tool = StructuredTool.from_function(
         func=sync_call_mcp_tool,
         name=tool_name,
         description=tool_description or f"MCP tool: {tool_name}",
-        # If we have a schema, we could parse it to add args_schema
-        # For now, keep it simple
+        args_schema=args_schema,
     )
 
+    _tool_wrappers[cache_key] = langchain_tool
+    return langchain_tool
 
-async def discover_mcp_tools() -> List[StructuredTool]:
+
+def create_batch_execute_tool(tools: List[StructuredTool]) -> StructuredTool:
     """
-    Automatically discover all available MCP tools and convert to LangChain tools
+    Create a LangChain tool that runs several MCP tool calls in one step
+
+    Sub-calls are dispatched concurrently over the shared MCP session, so
+    N independent lookups cost one agent step and one round of waiting.
+    Each sub-call is validated and cached exactly like a direct tool call.
+
+    Args:
+        tools: Wrapped MCP tools the batch may call
 
     Returns:
-        List of LangChain tools, one for each MCP tool
+        StructuredTool: LangChain tool named ``batch_execute``
     """
-    print("🔍 Discovering MCP tools...")
-
-    # Get MCP client
-    client = await get_mcp_client()
+    tools_by_name = {tool.name: tool for tool in tools}
+
+    def batch_execute(calls: List[Dict[str, Any]]) -> str:
+        """Synchronous wrapper that runs a batch of MCP tool calls"""
+        results: List[Dict[str, Any]] = [{} for _ in calls]
+        # (result index, tool name, canonical args) of calls not served from cache
+        pending: List[Tuple[int, str, str]] = []
+
+        for idx, call in enumerate(calls):
+            tool_name = call.get("tool") if isinstance(call, dict) else None
+            results[idx]["tool"] = tool_name
+
+            tool = tools_by_name.get(tool_name)
+            if tool is None:
+                results[idx]["error"] = f"Unknown tool: {tool_name!r}"
+                continue
+
+            try:
+                args_json = _validated_args_json(tool, call.get("args") or {})
+            except ValueError as e:
+                results[idx]["error"] = f"Invalid arguments: {e}"
+                continue
+
+            cached = get_cached_tool_result(tool_name, args_json)
+            if cached is not None:
+                results[idx]["result"] = cached
+            else:
+                pending.append((idx, tool_name, args_json))
+
+        if pending:
+            try:
+                outcomes = run_sync(
+                    run_all(
+                        [_call_tool_text(name, json.loads(args)) for _, name, args in pending],
+                        concurrency=BATCH_MAX_CONCURRENT,
+                        timeout=BATCH_CALL_TIMEOUT
+                    ),
+                    timeout=MCP_TOOL_TIMEOUT
+                )
+            except Exception as e:
+                return f"Error running batch_execute: {str(e)}"
+
+            for (idx, tool_name, args_json), outcome in zip(pending, outcomes):
+                if isinstance(outcome, BaseException):
+                    results[idx]["error"] = f"{type(outcome).__name__}: {outcome}"
+                else:
+                    cache_tool_result(tool_name, args_json, outcome)
+                    results[idx]["result"] = outcome
+
+        return _paginate(json.dumps(results, indent=2))
 
-    # List all available tools from MCP server
-    tools = await client.list_tools()
+    return StructuredTool.from_function(
+        func=batch_execute,
+        name="batch_execute",
+        description=(
+            "Run several independent DBT tool calls at once. "
+            "Pass `calls` as a list like "
+            '[{"tool": "<tool name>", "args": {...}}, ...]. '
+            "Returns a JSON list with one result (or error) per call, in order."
+        ),
+    )
 
-    print(f"✓ Found {len(tools)} MCP tools")
 
-    # Convert each MCP tool to a LangChain tool
-    langchain_tools = []
+async def discover_mcp_tools() -> List[StructuredTool]:
+    """
+    Automatically discover all available MCP tools and convert to LangChain tools
 
-    for mcp_tool in tools:
-        print(f"  • {mcp_tool.name}: {mcp_tool.description[:60]}...")
+    Returns:
+        List of LangChain tools, one for each MCP tool plus ``batch_execute``
+        and ``get_more_results``
+    """
+    logger.debug("Discovering MCP tools...")
+
+    # Reuse a cached tool list so a cold start can skip the server handshake;
+    # the connection is then opened lazily on the first tool call
+    tools = get_cached_tools()
+
+    if tools is None:
+        # Get MCP client
+        client = await get_mcp_client()
+
+        # List all available tools from MCP server
+        tools = await client.list_tools()
+
+    # Drop execution tools so their schemas never reach the prompt
+    skipped = [t.name for t in tools if not t.name.startswith(ALLOWED_TOOL_PREFIXES)]
+    if skipped:
+        logger.info("Skipped %d MCP tools: %s", len(skipped), ", ".join(skipped))
+        tools = [t for t in tools if t.name.startswith(ALLOWED_TOOL_PREFIXES)]
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            f"Found {len(tools)} MCP tools\n"
+            + "\n".join(
+                f"  • {mcp_tool.name}: {(mcp_tool.description or '')[:60]}..."
+                for mcp_tool in tools
+            )
+        )
 
-        langchain_tool = create_mcp_tool_wrapper(
+    # Convert each MCP tool to a LangChain tool
+    langchain_tools = [
+        create_mcp_tool_wrapper(
             tool_name=mcp_tool.name,
             tool_description=mcp_tool.description,
-            tool_schema=mcp_tool.inputSchema if hasattr(mcp_tool, 'inputSchema') else None
+            tool_schema=getattr(mcp_tool, 'inputSchema', None)
         )
+        for mcp_tool in tools
+    ]
 
-        langchain_tools.append(langchain_tool)
+    # Let the agent fan out independent lookups in a single step
+    langchain_tools.append(create_batch_execute_tool(langchain_tools))
 
-    print(f"✓ Created {len(langchain_tools)} LangChain tool wrappers\n")
+    # Let the agent page through results too large to return at once
+    langchain_tools.append(create_get_more_results_tool())
+
+    logger.info("Created %d LangChain tool wrappers", len(langchain_tools))
 
     return langchain_tools
 
 
-def create_dbt_agent():
+@functools.lru_cache(maxsize=1)
+def _ensure_env() -> Optional[str]:
     """
-    Create a DBT data discovery agent with automatic MCP tool discovery
+    Load environment variables from the .env file on first use
 
     Returns:
-        CompiledGraph: Configured agent ready to answer questions
+        The OpenAI API key, or None if it is not set
+    """
+    load_dotenv()
+    return os.getenv("OPENAI_API_KEY")
 
-    Raises:
-        ValueError: If OPENAI_API_KEY is not set
+
+# Serializes agent construction so concurrent first callers (e.g. a startup
+# warm-up thread and the first question) share one build instead of racing
+_agent_build_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _build_agent(api_key: str, model: str):
     """
-    # Check for API key
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError(
-            "OPENAI_API_KEY environment variable is not set. "
-            "Please set it in your .env file or environment."
-        )
+    Build the compiled agent graph
+
+    Memoized so repeated calls with the same API key and model reuse the
+    LLM client, tool wrappers and compiled graph.
+
+    Args:
+        api_key: OpenAI API key
+        model: OpenAI chat model name
+
+    Returns:
+        CompiledGraph: Configured agent ready to answer questions
+    """
+    # Imported here so importing this module stays cheap until an agent is needed
+    from langchain_openai import ChatOpenAI
+    from langgraph.prebuilt import create_react_agent
 
     # Initialize the LLM
     llm = ChatOpenAI(
-        model="gpt-4o-mini",
+        model=model,
         temperature=0,
-        api_key=api_key
+        api_key=api_key,
+        extra_body={"prompt_cache_key": PROMPT_CACHE_KEY},
+        # Report token usage (including cached tokens) when streaming too
+        stream_usage=True
     )
 
-    # Discover MCP tools automatically
-    tools = asyncio.run(discover_mcp_tools())
+    # Discover MCP tools automatically (on the loop that owns the MCP session)
+    tools = run_sync(discover_mcp_tools(), timeout=MCP_CONNECT_TIMEOUT)
+
+    # Tool schemas are part of the cached prefix, so keep their order stable
+    tools = sorted(tools, key=lambda tool: tool.name)
 
     # Create the agent using LangGraph
-    agent = create_react_agent(
+    return create_react_agent(
         model=llm,
         tools=tools,  # All MCP tools automatically available
-        prompt=SYSTEM_PROMPT
+        prompt=SYSTEM_MESSAGE
     )
 
-    return agent
 
+def create_dbt_agent():
+    """
+    Create a DBT data discovery agent with automatic MCP tool discovery
+
+    Returns:
+        CompiledGraph: Configured agent ready to answer questions
 
-# Global agent instance (lazy initialization)
-_agent = None
+    Raises:
+        ValueError: If OPENAI_API_KEY is not set
+    """
+    # Check for API key
+    api_key = _ensure_env()
+    if not api_key:
+        raise ValueError(
+            "OPENAI_API_KEY environment variable is not set. "
+            "Please set it in your .env file or environment."
+        )
+
+    with _agent_build_lock:
+        return _build_agent(api_key, DEFAULT_MODEL)
+
+
+# Answers to previously asked questions
+_answer_cache = AnswerCache()
 
 
 def get_agent():
@@ -182,37 +593,81 @@ def get_agent():
     Returns:
         CompiledGraph: The agent instance
     """
-    global _agent
+    return create_dbt_agent()
+
+
+def get_cached_answer(question: str) -> Optional[str]:
+    """
+    Look up a previously cached answer without calling the agent
+
+    Args:
+        question: The question in natural language
+
+    Returns:
+        The cached answer, or None if the question has not been answered
+    """
+    return _answer_cache.get(question)
+
+
+def clear_answer_cache() -> None:
+    """Forget all cached answers, e.g. after the dbt project has changed"""
+    _answer_cache.clear()
 
-    if _agent is None:
-        _agent = create_dbt_agent()
 
-    return _agent
+def _log_prompt_cache_usage(messages: List[Any]) -> None:
+    """Log how many prompt tokens each LLM call read from the prompt cache"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
 
+    for msg in messages:
+        usage = getattr(msg, "usage_metadata", None)
+        if usage:
+            cached = (usage.get("input_token_details") or {}).get("cache_read", 0)
+            logger.debug(
+                "Prompt tokens: %d, served from cache: %d",
+                usage["input_tokens"], cached
+            )
 
-def ask_agent(question: str) -> str:
+
+def _extract_answer(result: Dict[str, Any]) -> str:
+    """Extract the final answer from an agent result"""
+    messages = result.get("messages", [])
+    for msg in reversed(messages):
+        if hasattr(msg, 'type') and msg.type == 'ai':
+            return msg.content
+        elif hasattr(msg, 'content') and isinstance(msg.content, str):
+            return msg.content
+
+    return str(result)
+
+
+def ask_agent(
+    question: str,
+    use_cache: bool = True,
+    agent=None
+) -> str:
     """
     Ask the agent a question about DBT data
 
     Args:
         question: The question to ask in natural language
+        use_cache: Whether to answer from (and store in) the answer cache
+        agent: Agent to use; defaults to the global agent
 
     Returns:
         str: The agent's answer
     """
+    if use_cache:
+        cached = _answer_cache.get(question)
+        if cached is not None:
+            return cached
+
     try:
-        agent = get_agent()
+        if agent is None:
+            agent = get_agent()
         result = agent.invoke({"messages": [("user", question)]})
-
-        # Extract response
-        messages = result.get("messages", [])
-        for msg in reversed(messages):
-            if hasattr(msg, 'type') and msg.type == 'ai':
-                return msg.content
-            elif hasattr(msg, 'content') and isinstance(msg.content, str):
-                return msg.content
-
-        return str(result)
+        _log_prompt_cache_usage(result.get("messages", []))
+        answer = _extract_answer(result)
 
     except KeyboardInterrupt:
         return "Query interrupted by user."
@@ -221,9 +676,149 @@ def ask_agent(question: str) -> str:
     except Exception as e:
         return f"Sorry, an error occurred: {type(e).__name__} - {str(e)}"
 
+    # Only successful answers are cached
+    if use_cache:
+        _answer_cache.put(question, answer)
+
+    return answer
+
+
+def ask_agent_stream(question: str, use_cache: bool = True, agent=None) -> Iterator[str]:
+    """
+    Ask the agent a question and yield the answer as it is generated
+
+    Yields LLM tokens as they arrive instead of waiting for the complete
+    response. A cached answer is yielded in one piece.
+
+    Text the model writes in earlier steps (e.g. "Let me look that up"
+    before a tool call) is still shown, separated by a blank line, but only
+    the text of the final step is cached as the answer.
+
+    Args:
+        question: The question to ask in natural language
+        use_cache: Whether to answer from (and store in) the answer cache
+        agent: Agent to use; defaults to the global agent
+
+    Yields:
+        str: Chunks of the agent's answer
+
+    Raises:
+        Exception: Any failure from the agent or its tools
+    """
+    if use_cache:
+        cached = _answer_cache.get(question)
+        if cached is not None:
+            yield cached
+            return
+
+    if agent is None:
+        agent = get_agent()
+
+    # Text of the current LLM step; a later step supersedes it
+    chunks = []
+    step = None
+    yielded = False
+
+    for message, metadata in agent.stream(
+        {"messages": [("user", question)]},
+        stream_mode="messages"
+    ):
+        # Tool results stream through here too; only forward model text
+        if not isinstance(message, AIMessageChunk):
+            continue
+
+        # Usage arrives on the last chunk of each LLM call
+        if message.usage_metadata:
+            _log_prompt_cache_usage([message])
+
+        if metadata.get("langgraph_step") != step:
+            step = metadata.get("langgraph_step")
+            chunks = []
+
+        # Text that accompanies a tool call is not part of the answer
+        if message.tool_call_chunks or not isinstance(message.content, str) or not message.content:
+            continue
+
+        # Keep earlier steps' text from running into this one on screen
+        if yielded and not chunks:
+            yield "\n\n"
+
+        chunks.append(message.content)
+        yielded = True
+        yield message.content
+
+    # Only complete answers are cached
+    if use_cache and chunks:
+        _answer_cache.put(question, "".join(chunks))
+
+
+# Marks the start of each answer in a batched warm-up response
+_WARM_ANSWER_PATTERN = re.compile(r"^### Answer (\d+)\s*$", re.MULTILINE)
+
+# Prevents overlapping warm-ups from paying for the same batch twice
+_warm_lock = threading.Lock()
+
+
+def warm_answers(questions: Sequence[str], agent=None) -> Dict[str, str]:
+    """
+    Pre-answer questions in a single agent run and cache the answers
+
+    All uncached questions are sent as one numbered prompt, so the system
+    prompt and tool schemas are paid for once instead of once per question.
+    Does nothing if another warm-up is already running.
+
+    Args:
+        questions: Questions to pre-answer
+        agent: Agent to use; defaults to the global agent
+
+    Returns:
+        Dict of the questions that were answered and cached
+    """
+    if not _warm_lock.acquire(blocking=False):
+        return {}
+
+    try:
+        missing = [q for q in questions if _answer_cache.get(q) is None]
+        if not missing:
+            return {}
+
+        prompt = (
+            "Answer each of the following questions independently. "
+            "Start each answer with a line containing only "
+            "'### Answer <number>', using the question's number.\n\n"
+            + "\n".join(f"{idx}. {q}" for idx, q in enumerate(missing, 1))
+        )
+
+        if agent is None:
+            agent = get_agent()
+        result = agent.invoke({"messages": [("user", prompt)]})
+        _log_prompt_cache_usage(result.get("messages", []))
+        response = _extract_answer(result)
+
+        # re.split with one group gives [preamble, number, answer, number, answer, ...]
+        parts = _WARM_ANSWER_PATTERN.split(response)
+        answers = {}
+        for number, answer in zip(parts[1::2], parts[2::2]):
+            idx = int(number) - 1
+            if 0 <= idx < len(missing) and answer.strip():
+                answers[missing[idx]] = answer.strip()
+                _answer_cache.put(missing[idx], answer.strip())
+
+        logger.info("Warmed %d of %d answers", len(answers), len(missing))
+        return answers
+
+    except Exception as e:
+        logger.warning("Answer warm-up failed: %s", e)
+        return {}
+
+    finally:
+        _warm_lock.release()
+
 
 if __name__ == "__main__":
     """Test the simplified agent"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("\n" + "=" * 80)
     print("  DBT Agent with Automatic MCP Tool Discovery")
     print("=" * 80 + "\n")
@@ -0,0 +1,190 @@
+"""
+Agent Answer Cache
+
+Caches agent answers by question so repeated questions skip the LLM and
+MCP round-trips entirely.
+
+Questions are matched exactly after normalizing case and whitespace. When
+the optional ``sentence-transformers`` package is installed, reworded
+questions are also matched by embedding cosine similarity, provided they
+name exactly the same identifiers (table, model and column names).
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, FrozenSet, Optional, Tuple
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+
+logger = logging.getLogger(__name__)
+
+# Small, fast embedding model suited to short questions
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Word tokens, keeping dotted names such as schema.table together
+_TOKEN_PATTERN = re.compile(r"\w+(?:\.\w+)*")
+
+
+class AnswerCache:
+    """
+    Bounded question -> answer cache with optional semantic matching
+
+    Entries expire ``ttl`` seconds after they are stored, so answers do not
+    outlive changes to the dbt project for long, and are evicted
+    least-recently-used once ``max_entries`` is reached. Safe to share
+    between threads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        similarity_threshold: float = 0.9,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        ttl: Optional[float] = 3600.0
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.model_name = model_name
+        # normalized question -> (stored at, embedding or None, identifiers, answer)
+        self._entries: "OrderedDict[str, Tuple[float, Any, FrozenSet[str], str]]" = OrderedDict()
+        self._model: Optional[Any] = None
+        # Set once the embedding model fails to load or encode
+        self._semantic_failed = False
+        self._lock = threading.Lock()
+
+    @property
+    def semantic(self) -> bool:
+        """Whether similarity matching is available"""
+        return SentenceTransformer is not None and not self._semantic_failed
+
+    @staticmethod
+    def _normalize(question: str) -> str:
+        """Normalize case and whitespace for exact matching"""
+        return " ".join(question.lower().split())
+
+    @staticmethod
+    def _identifiers(key: str) -> FrozenSet[str]:
+        """
+        Extract identifier-like tokens from a normalized question
+
+        Snake_case, dotted and digit-bearing tokens (dim_customers,
+        analytics.orders, fct_sales_2024) name specific objects. Embeddings
+        barely tell them apart, so semantic matches must agree on them.
+        """
+        return frozenset(
+            token for token in _TOKEN_PATTERN.findall(key)
+            if "_" in token or "." in token or any(c.isdigit() for c in token)
+        )
+
+    def _drop_expired(self) -> None:
+        """Remove entries older than the TTL; call with the lock held"""
+        if self.ttl is None:
+            return
+
+        cutoff = time.monotonic() - self.ttl
+        expired = [key for key, entry in self._entries.items() if entry[0] <= cutoff]
+        for key in expired:
+            del self._entries[key]
+
+    def _embed(self, text: str) -> Optional[Any]:
+        """
+        Embed text as a unit vector, loading the model on first use
+
+        If the model cannot be loaded or used (e.g. no network to download
+        it), semantic matching is switched off for good and the cache
+        falls back to exact matching instead of retrying on every call.
+        """
+        if not self.semantic:
+            return None
+
+        try:
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_name)
+            return self._model.encode(text, normalize_embeddings=True)
+        except Exception as e:
+            self._semantic_failed = True
+            logger.warning("Semantic answer matching disabled, using exact matching only: %s", e)
+            return None
+
+    def get(self, question: str) -> Optional[str]:
+        """
+        Look up a cached answer
+
+        Args:
+            question: The user's question
+
+        Returns:
+            The cached answer, or None on a miss
+        """
+        key = self._normalize(question)
+
+        with self._lock:
+            self._drop_expired()
+
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][3]
+
+            if not self.semantic or not self._entries:
+                return None
+
+        embedding = self._embed(key)
+        if embedding is None:
+            return None
+        identifiers = self._identifiers(key)
+
+        with self._lock:
+            self._drop_expired()
+
+            best_key = None
+            best_score = self.similarity_threshold
+
+            for cached_key, (_, cached_embedding, cached_identifiers, _) in self._entries.items():
+                if cached_embedding is None or cached_identifiers != identifiers:
+                    continue
+                # Embeddings are unit vectors, so the dot product is the cosine
+                score = float(cached_embedding @ embedding)
+                if score >= best_score:
+                    best_key, best_score = cached_key, score
+
+            if best_key is None:
+                return None
+
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][3]
+
+    def put(self, question: str, answer: str) -> None:
+        """
+        Store an answer
+
+        Args:
+            question: The user's question
+            answer: The agent's answer
+        """
+        key = self._normalize(question)
+        embedding = self._embed(key)
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), embedding, self._identifiers(key), answer)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached answers"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._drop_expired()
+            return len(self._entries)
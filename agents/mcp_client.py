@@ -6,11 +6,310 @@ Implements singleton pattern for global client management.
 """
 
 import asyncio
-from typing import Optional, Any, Dict, List
+import atexit
+import concurrent.futures
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from collections import OrderedDict
+from typing import Optional, Any, Coroutine, Dict, Iterable, List, Tuple
 from contextlib import AsyncExitStack
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.types import Tool
+
+
+logger = logging.getLogger(__name__)
+
+# Long-lived event loop that owns the MCP session; the stdio transport is
+# bound to the loop it was opened on, so every client coroutine runs here
+_loop = asyncio.new_event_loop()
+_loop_thread = threading.Thread(
+    target=_loop.run_forever,
+    name="mcp-event-loop",
+    daemon=True
+)
+_loop_thread.start()
+
+
+def submit(coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+    """
+    Schedule a coroutine on the background MCP event loop
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        concurrent.futures.Future resolving to the coroutine's result
+
+    Example:
+        ```python
+        client = submit(get_mcp_client()).result()
+        ```
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _loop)
+
+
+def run_sync(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the background MCP event loop and wait for its result
+
+    This is the single sync -> async bridge for MCP work. It behaves the
+    same whether or not the calling thread already has a running event
+    loop (e.g. Streamlit or a notebook), because the MCP session is bound
+    to the background loop and must never be driven from another one.
+    Hosts should not use ``nest_asyncio`` to re-enter a running loop.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Optional maximum time to wait in seconds
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        RuntimeError: If called from the background loop itself
+        TimeoutError: If the timeout expires (the coroutine is cancelled)
+    """
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError(
+            "run_sync() called from the MCP event loop; await the coroutine instead."
+        )
+
+    future = submit(coro)
+    try:
+        return future.result(timeout=timeout)
+    except BaseException:
+        future.cancel()
+        raise
+
+
+async def run_all(
+    coros: Iterable[Coroutine[Any, Any, Any]],
+    concurrency: int,
+    timeout: Optional[float] = None
+) -> List[Any]:
+    """
+    Run coroutines concurrently and wait for all of them
+
+    Use this for every scatter/gather over the MCP session rather than
+    polling asyncio.wait(..., return_when=FIRST_COMPLETED) in a loop.
+
+    Args:
+        coros: Coroutines to run
+        concurrency: Maximum number running at once
+        timeout: Optional per-coroutine timeout in seconds
+
+    Returns:
+        Results in input order; failures are returned as exception objects
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _bounded(coro: Coroutine[Any, Any, Any]) -> Any:
+        async with semaphore:
+            if timeout is None:
+                return await coro
+            return await asyncio.wait_for(coro, timeout=timeout)
+
+    return await asyncio.gather(
+        *[_bounded(coro) for coro in coros],
+        return_exceptions=True
+    )
+
+
+# How long a discovered tool list stays valid (seconds)
+TOOLS_CACHE_TTL = 3600.0
+
+# On-disk copy of the tool list so a cold start can skip the MCP handshake
+TOOLS_CACHE_FILE = Path.home() / ".cache" / "dbt_mcp_tools.json"
+
+# Discovered tools keyed by server-params hash, with their fetch timestamps
+_tools_cache: Dict[str, List[Any]] = {}
+_tools_cache_ts: Dict[str, float] = {}
+
+
+def _server_params_key(server_params: StdioServerParameters) -> str:
+    """Hash the server launch parameters into a tools-cache key"""
+    payload = json.dumps(
+        {
+            "command": server_params.command,
+            "args": server_params.args,
+            "env": server_params.env,
+        },
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# .env file passed to the DBT MCP Server, resolved once against the start-up
+# working directory
+ENV_FILE = Path("./.env").resolve()
+
+if not ENV_FILE.is_file():
+    logger.warning("Env file not found at %s; the DBT MCP Server may fail to start", ENV_FILE)
+
+# Parameters used to launch the DBT MCP Server over stdio
+SERVER_PARAMS = StdioServerParameters(
+    command="uvx",
+    args=["--env-file", str(ENV_FILE), "dbt-mcp"],
+    env=None
+)
+SERVER_PARAMS_KEY = _server_params_key(SERVER_PARAMS)
+
+
+def _tools_cache_key(server_params: Optional[StdioServerParameters]) -> str:
+    """Get the tools-cache key, reusing the precomputed default-server key"""
+    if server_params is None or server_params is SERVER_PARAMS:
+        return SERVER_PARAMS_KEY
+    return _server_params_key(server_params)
+
+
+def _read_tools_cache_file() -> Dict[str, Any]:
+    """Load the persisted tools cache, returning an empty dict if unusable"""
+    try:
+        return json.loads(TOOLS_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_tools_cache_file(key: str, tools: List[Any], fetched_at: float) -> None:
+    """Persist a tool list for the given server key"""
+    data = _read_tools_cache_file()
+    data[key] = {
+        "fetched_at": fetched_at,
+        "tools": [tool.model_dump(mode="json") for tool in tools],
+    }
+
+    try:
+        TOOLS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        TOOLS_CACHE_FILE.write_text(json.dumps(data), encoding="utf-8")
+    except OSError as e:
+        logger.warning("Failed to write tools cache: %s", e)
+
+
+def get_cached_tools(
+    server_params: Optional[StdioServerParameters] = None,
+    persistent: bool = True
+) -> Optional[List[Any]]:
+    """
+    Get the cached tool list without connecting to the server
+
+    Checks the in-memory cache first, then the on-disk cache. Entries
+    older than TOOLS_CACHE_TTL are ignored.
+
+    Args:
+        server_params: Server parameters the tools were discovered from
+        persistent: Whether to fall back to the on-disk cache
+
+    Returns:
+        List of tool objects, or None on a cache miss
+    """
+    key = _tools_cache_key(server_params)
+    now = time.time()
+
+    if key in _tools_cache and now - _tools_cache_ts[key] < TOOLS_CACHE_TTL:
+        return _tools_cache[key]
+
+    if not persistent:
+        return None
+
+    entry = _read_tools_cache_file().get(key)
+    if not entry or now - entry.get("fetched_at", 0) >= TOOLS_CACHE_TTL:
+        return None
+
+    try:
+        tools = [Tool.model_validate(tool) for tool in entry["tools"]]
+    except (KeyError, ValueError):
+        return None
+
+    _tools_cache[key] = tools
+    _tools_cache_ts[key] = entry["fetched_at"]
+    return tools
+
+
+def invalidate_tools_cache(persistent: bool = False) -> None:
+    """
+    Drop cached tool lists
+
+    Args:
+        persistent: Also delete the on-disk cache file
+    """
+    _tools_cache.clear()
+    _tools_cache_ts.clear()
+
+    if persistent:
+        try:
+            TOOLS_CACHE_FILE.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# How long a tool call result stays valid (seconds); shorter than the tool
+# list TTL because dbt metadata changes whenever models are rebuilt
+TOOL_RESULT_CACHE_TTL = 600.0
+
+# Maximum number of tool call results kept
+TOOL_RESULT_CACHE_SIZE = 512
+
+# (tool name, canonical JSON arguments) -> (fetch timestamp, result text)
+_tool_result_cache: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+_tool_result_cache_lock = threading.Lock()
+
+
+def get_cached_tool_result(tool_name: str, args_json: str) -> Optional[str]:
+    """
+    Get a cached tool call result
+
+    Args:
+        tool_name: Name of the tool
+        args_json: Tool arguments serialized with sorted keys
+
+    Returns:
+        The result text, or None on a miss or if the entry has expired
+    """
+    key = (tool_name, args_json)
+
+    with _tool_result_cache_lock:
+        entry = _tool_result_cache.get(key)
+        if entry is None:
+            return None
+
+        if time.time() - entry[0] >= TOOL_RESULT_CACHE_TTL:
+            del _tool_result_cache[key]
+            return None
+
+        _tool_result_cache.move_to_end(key)
+        return entry[1]
+
+
+def cache_tool_result(tool_name: str, args_json: str, text: str) -> None:
+    """
+    Store a successful tool call result
+
+    Args:
+        tool_name: Name of the tool
+        args_json: Tool arguments serialized with sorted keys
+        text: Result text
+    """
+    key = (tool_name, args_json)
+
+    with _tool_result_cache_lock:
+        _tool_result_cache[key] = (time.time(), text)
+        _tool_result_cache.move_to_end(key)
+
+        while len(_tool_result_cache) > TOOL_RESULT_CACHE_SIZE:
+            _tool_result_cache.popitem(last=False)
+
+
+def invalidate_tool_results() -> None:
+    """Drop all cached tool call results"""
+    with _tool_result_cache_lock:
+        _tool_result_cache.clear()
 
 
 class DBTMCPClient:
@@ -22,38 +321,44 @@ class DBTMCPClient:
     """
 
     def __init__(self):
+        self.server_params: StdioServerParameters = SERVER_PARAMS
         self.session: Optional[ClientSession] = None
         self.exit_stack: Optional[AsyncExitStack] = None
         self._connected: bool = False
+        # Ensures concurrent connect() calls spawn a single server process
+        self._connect_lock: asyncio.Lock = asyncio.Lock()
 
     async def connect(self) -> None:
         """
         Connect to the DBT MCP Server
 
         Establishes stdio connection and initializes the session.
-        Prints available tools after successful connection.
+        Logs available tools after successful connection. Concurrent
+        callers wait for the first connection instead of opening their own.
 
         Raises:
             Exception: If connection fails or server is unreachable
         """
         if self._connected:
-            print("Already connected to MCP Server")
+            logger.debug("Already connected to MCP Server")
             return
 
-        try:
-            # Configure server parameters for stdio communication
-            server_params = StdioServerParameters(
-                command="uvx",
-                args=["--env-file", "./.env", "dbt-mcp"],
-                env=None
-            )
+        async with self._connect_lock:
+            # Another caller may have connected while we waited for the lock
+            if self._connected:
+                return
+
+            await self._open_session()
 
+    async def _open_session(self) -> None:
+        """Start the server subprocess and initialize the MCP session"""
+        try:
             # Create exit stack for resource management
             self.exit_stack = AsyncExitStack()
 
             # Connect to server via stdio
             stdio_transport = await self.exit_stack.enter_async_context(
-                stdio_client(server_params)
+                stdio_client(self.server_params)
             )
 
             # Create and initialize session
@@ -66,37 +371,41 @@ class DBTMCPClient:
             await self.session.initialize()
 
             self._connected = True
-            print("Successfully connected to DBT MCP Server")
+            logger.info("Successfully connected to DBT MCP Server")
 
-            # List available tools
-            await self._list_available_tools()
+            # List available tools (skipped entirely when nobody would see it)
+            if logger.isEnabledFor(logging.INFO):
+                await self._list_available_tools()
 
-        except Exception as e:
-            print(f"Failed to connect to MCP Server: {e}")
+        except BaseException as e:
+            # Also on cancellation (e.g. a run_sync timeout), so a half-started
+            # server process is not left behind
+            logger.error("Failed to connect to MCP Server: %r", e)
             if self.exit_stack:
                 await self.exit_stack.aclose()
                 self.exit_stack = None
             raise
 
     async def _list_available_tools(self) -> None:
-        """Print all available tools from the MCP Server"""
+        """Log all available tools from the MCP Server"""
         if not self.session:
             return
 
         try:
-            response = await self.session.list_tools()
-            tools = response.tools
+            # Goes through the tools cache, so discovery right after
+            # connecting does not repeat the round-trip
+            tools = await self.list_tools()
 
-            print(f"\nAvailable Tools ({len(tools)}):")
-            print("-" * 60)
+            lines = [f"Available Tools ({len(tools)}):", "-" * 60]
             for tool in tools:
-                print(f"  • {tool.name}")
+                lines.append(f"  • {tool.name}")
                 if tool.description:
-                    print(f"    {tool.description}")
-            print("-" * 60)
+                    lines.append(f"    {tool.description}")
+            lines.append("-" * 60)
+            logger.info("\n".join(lines))
 
         except Exception as e:
-            print(f"Failed to list tools: {e}")
+            logger.warning("Failed to list tools: %s", e)
 
     async def call_tool(
         self,
@@ -128,37 +437,62 @@ class DBTMCPClient:
             return result
 
         except Exception as e:
-            print(f"Failed to call tool '{tool_name}': {e}")
+            logger.error("Failed to call tool '%s': %s", tool_name, e)
             raise
 
-    async def list_tools(self) -> List[Any]:
+    async def list_tools(self, use_cache: bool = True) -> List[Any]:
         """
         Get list of available tools
 
+        The tool list is stable for a server session, so it is served from
+        the in-memory tools cache when possible and stored in both the
+        in-memory and on-disk caches on a miss.
+
+        Args:
+            use_cache: Whether to read from the tools cache
+
         Returns:
             List of tool objects
 
         Raises:
             RuntimeError: If not connected to server
         """
+        if use_cache:
+            tools = get_cached_tools(self.server_params, persistent=False)
+            if tools is not None:
+                return tools
+
         if not self._connected or not self.session:
             raise RuntimeError("Not connected to MCP Server. Call connect() first.")
 
         response = await self.session.list_tools()
-        return response.tools
+        tools = response.tools
+
+        key = _tools_cache_key(self.server_params)
+        fetched_at = time.time()
+        _tools_cache[key] = tools
+        _tools_cache_ts[key] = fetched_at
+        _write_tools_cache_file(key, tools, fetched_at)
+
+        return tools
 
     async def close(self) -> None:
         """
         Close the MCP Server connection
 
         Properly cleans up resources and closes the session.
+        The in-memory tools cache and cached tool results are dropped so a
+        reconnect re-validates them.
         """
+        invalidate_tools_cache()
+        invalidate_tool_results()
+
         if self.exit_stack:
             try:
                 await self.exit_stack.aclose()
-                print("MCP Server connection closed")
+                logger.info("MCP Server connection closed")
             except Exception as e:
-                print(f"Error closing connection: {e}")
+                logger.warning("Error closing connection: %s", e)
             finally:
                 self.exit_stack = None
                 self.session = None
@@ -182,6 +516,23 @@ class DBTMCPClient:
 # Singleton instance
 _client_instance: Optional[DBTMCPClient] = None
 
+# Guards get_mcp_client() so concurrent callers share one connect. Created
+# lazily because an asyncio.Lock is bound to the loop it is first used on.
+_connect_lock: Optional[asyncio.Lock] = None
+_connect_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_connect_lock() -> asyncio.Lock:
+    """Get the connect lock for the running event loop"""
+    global _connect_lock, _connect_lock_loop
+
+    loop = asyncio.get_running_loop()
+    if _connect_lock is None or _connect_lock_loop is not loop:
+        _connect_lock = asyncio.Lock()
+        _connect_lock_loop = loop
+
+    return _connect_lock
+
 
 async def get_mcp_client() -> DBTMCPClient:
     """
@@ -201,11 +552,15 @@ async def get_mcp_client() -> DBTMCPClient:
     """
     global _client_instance
 
-    if _client_instance is None:
-        _client_instance = DBTMCPClient()
+    if _client_instance is not None and _client_instance.is_connected:
+        return _client_instance
 
-    if not _client_instance.is_connected:
-        await _client_instance.connect()
+    async with _get_connect_lock():
+        if _client_instance is None:
+            _client_instance = DBTMCPClient()
+
+        if not _client_instance.is_connected:
+            await _client_instance.connect()
 
     return _client_instance
 
@@ -221,3 +576,23 @@ async def close_global_client() -> None:
     if _client_instance is not None:
         await _client_instance.close()
         _client_instance = None
+
+
+# Seconds to wait for the MCP Server to shut down at interpreter exit
+MCP_CLOSE_TIMEOUT = 10
+
+
+def _close_global_client_at_exit() -> None:
+    """Close the global client on interpreter exit so the server is not orphaned"""
+    if _client_instance is None:
+        return
+
+    try:
+        run_sync(close_global_client(), timeout=MCP_CLOSE_TIMEOUT)
+    except Exception as e:
+        logger.warning("Failed to close MCP Server at exit: %s", e)
+
+
+# Registered at import, so exactly once per process however often the
+# host (e.g. a Streamlit script rerun) asks for the client
+atexit.register(_close_global_client_at_exit)
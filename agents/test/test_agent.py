@@ -5,6 +5,8 @@ Tests the LangChain agent's ability to answer questions about DBT data
 using MCP tools.
 """
 
+import logging
+
 from agents.agent import ask_agent
 
 
@@ -139,6 +141,8 @@ if __name__ == "__main__":
     """
     import sys
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Check for command-line arguments
     if len(sys.argv) > 1:
         mode = sys.argv[1].lower()
@@ -0,0 +1,309 @@
+"""
+Test Agent Helpers
+
+Offline unit tests for the agent's helpers. No MCP Server or OpenAI key
+is needed.
+"""
+
+import json
+import unittest
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+
+from agents import agent, answer_cache
+from agents.answer_cache import AnswerCache
+from agents.mcp_client import invalidate_tool_results
+
+
+class TestPagination(unittest.TestCase):
+    """_paginate and the get_more_results cursor"""
+
+    def setUp(self):
+        agent._stored_results.clear()
+        self.get_more_results = agent.create_get_more_results_tool()
+
+    def _next_cursor(self, page: str) -> Optional[str]:
+        marker = 'get_more_results(cursor="'
+        if marker not in page:
+            return None
+        return page.split(marker, 1)[1].split('"', 1)[0]
+
+    def test_short_result_is_returned_unchanged(self):
+        text = "x" * agent.MAX_TOOL_RESULT_CHARS
+
+        self.assertEqual(agent._paginate(text), text)
+        self.assertEqual(len(agent._stored_results), 0)
+
+    def test_pages_round_trip_to_full_text(self):
+        text = "".join(f"line {i}\n" for i in range(5000))
+        pages = []
+
+        page = agent._paginate(text)
+        while True:
+            cursor = self._next_cursor(page)
+            pages.append(page.split("\n\n[Truncated:", 1)[0] if cursor else page)
+            if cursor is None:
+                break
+            page = self.get_more_results.invoke({"cursor": cursor})
+
+        self.assertGreater(len(pages), 2)
+        self.assertEqual("".join(pages), text)
+
+    def test_unknown_cursor(self):
+        for cursor in ("missing:8000", "abc", "abc:xyz"):
+            result = self.get_more_results.invoke({"cursor": cursor})
+            self.assertTrue(result.startswith("Error: unknown or expired cursor"))
+
+    def test_stored_results_are_bounded(self):
+        for i in range(agent.MAX_STORED_RESULTS + 5):
+            agent._paginate(f"{i}-" + "y" * agent.MAX_TOOL_RESULT_CHARS)
+
+        self.assertEqual(len(agent._stored_results), agent.MAX_STORED_RESULTS)
+
+
+class TestArgsSchema(unittest.TestCase):
+    """_build_args_schema: MCP inputSchema -> Pydantic model"""
+
+    def _build(self, schema: Dict[str, Any]):
+        return agent._build_args_schema(json.dumps(schema, sort_keys=True))
+
+    def test_maps_types_and_required_fields(self):
+        model = self._build({
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "Model name"},
+                "limit": {"type": "integer"},
+                "ratio": {"type": "number"},
+                "deep": {"type": "boolean"},
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "owner": {"type": ["string", "null"]},
+            },
+            "required": ["name", "tags"],
+        })
+
+        args = model(name="orders", limit="5", tags=["a"], deep=True)
+        self.assertEqual(args.limit, 5)
+        self.assertIsNone(args.ratio)
+        self.assertIsNone(args.owner)
+        self.assertEqual(model.model_fields["name"].description, "Model name")
+
+        with self.assertRaises(ValueError):
+            model(tags=["a"])
+        with self.assertRaises(ValueError):
+            model(name="orders", tags="not a list")
+
+    def test_optional_field_keeps_schema_default(self):
+        model = self._build({
+            "type": "object",
+            "properties": {"limit": {"type": "integer", "default": 10}},
+        })
+
+        self.assertEqual(model().limit, 10)
+
+    def test_reserved_or_invalid_names_fall_back(self):
+        for name in ("schema", "model_config", "_private", "not-an-identifier"):
+            with self.subTest(name=name):
+                self.assertIsNone(self._build({
+                    "type": "object",
+                    "properties": {name: {"type": "string"}},
+                }))
+
+    def test_wrappers_without_compiled_schema_pass_arguments_through(self):
+        seen = []
+
+        def fake_cached_call(tool_name: str, args_json: str) -> str:
+            seen.append((tool_name, json.loads(args_json)))
+            return "ok"
+
+        reserved = agent.create_mcp_tool_wrapper(
+            "get_test_reserved",
+            "Reserved field names",
+            {"type": "object", "properties": {"schema": {"type": "string"}}}
+        )
+        schemaless = agent.create_mcp_tool_wrapper("get_test_schemaless", "No schema", None)
+
+        with mock.patch.object(agent, "_cached_call", fake_cached_call):
+            reserved.invoke({"schema": "analytics"})
+            schemaless.invoke({"limit": 5, "unset": None})
+
+        self.assertEqual(seen, [
+            ("get_test_reserved", {"schema": "analytics"}),
+            ("get_test_schemaless", {"limit": 5}),
+        ])
+        # The LLM is still shown the real parameters
+        self.assertEqual(reserved.tool_call_schema["properties"], {"schema": {"type": "string"}})
+
+
+class TestBatchExecute(unittest.TestCase):
+    """batch_execute shares validation, caching and errors with direct calls"""
+
+    def setUp(self):
+        invalidate_tool_results()
+        self.calls: List[Any] = []
+
+        async def fake_call_tool_text(tool_name: str, arguments: Dict[str, Any]) -> str:
+            self.calls.append((tool_name, arguments))
+            if tool_name == "get_broken":
+                raise RuntimeError("tool failed")
+            return f"{tool_name} {json.dumps(arguments, sort_keys=True)}"
+
+        patcher = mock.patch.object(agent, "_call_tool_text", fake_call_tool_text)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(invalidate_tool_results)
+
+        schema = {
+            "type": "object",
+            "properties": {"name": {"type": "string"}, "limit": {"type": "integer"}},
+            "required": ["name"],
+        }
+        self.get_model = agent.create_mcp_tool_wrapper("get_test_model", "d", schema)
+        self.get_broken = agent.create_mcp_tool_wrapper("get_broken", "d", None)
+        self.batch = agent.create_batch_execute_tool([self.get_model, self.get_broken])
+
+    def test_results_errors_and_cache(self):
+        self.get_model.invoke({"name": "orders"})
+
+        results = json.loads(self.batch.invoke({"calls": [
+            {"tool": "get_test_model", "args": {"name": "orders", "limit": None}},
+            {"tool": "get_test_model", "args": {"name": "customers", "limit": "3"}},
+            {"tool": "get_test_model", "args": {"limit": 3}},
+            {"tool": "get_broken"},
+            {"tool": "run"},
+        ]}))
+
+        self.assertEqual(results[0]["result"], 'get_test_model {"name": "orders"}')
+        self.assertEqual(results[1]["result"], 'get_test_model {"limit": 3, "name": "customers"}')
+        self.assertIn("Invalid arguments", results[2]["error"])
+        self.assertEqual(results[3]["error"], "RuntimeError: tool failed")
+        self.assertEqual(results[4]["error"], "Unknown tool: 'run'")
+
+        # The first sub-call was served from the direct call's cache entry
+        self.assertEqual(self.calls, [
+            ("get_test_model", {"name": "orders"}),
+            ("get_test_model", {"limit": 3, "name": "customers"}),
+            ("get_broken", {}),
+        ])
+
+    def test_tools_without_compiled_schema_pass_arguments_through(self):
+        reserved = agent.create_mcp_tool_wrapper(
+            "get_test_reserved",
+            "Reserved field names",
+            {"type": "object", "properties": {"schema": {"type": "string"}, "json": {"type": "string"}}}
+        )
+        schemaless = agent.create_mcp_tool_wrapper("get_test_schemaless", "No schema", None)
+        batch = agent.create_batch_execute_tool([self.get_model, reserved, schemaless])
+
+        results = json.loads(batch.invoke({"calls": [
+            {"tool": "get_test_reserved", "args": {"schema": "analytics", "json": "x"}},
+            {"tool": "get_test_schemaless", "args": {"limit": 5, "unset": None}},
+            # Undeclared keys are dropped, even ones naming BaseModel attributes
+            {"tool": "get_test_model", "args": {"name": "orders", "copy": "dropped"}},
+        ]}))
+
+        self.assertTrue(all("result" in result for result in results))
+        self.assertEqual(self.calls, [
+            ("get_test_reserved", {"json": "x", "schema": "analytics"}),
+            ("get_test_schemaless", {"limit": 5}),
+            ("get_test_model", {"name": "orders"}),
+        ])
+
+
+class FakeAgent:
+    """Agent stand-in returning canned invoke and stream output"""
+
+    def __init__(self, response: str = "", stream_items: Optional[List[Any]] = None):
+        self.response = response
+        self.stream_items = stream_items or []
+        self.prompts: List[str] = []
+
+    def invoke(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        self.prompts.append(inputs["messages"][0][1])
+        return {"messages": [AIMessage(content=self.response)]}
+
+    def stream(self, inputs: Dict[str, Any], stream_mode: str = None):
+        self.prompts.append(inputs["messages"][0][1])
+        yield from self.stream_items
+
+
+class AnswerCacheTestCase(unittest.TestCase):
+    """Gives each test a fresh, exact-match-only answer cache"""
+
+    def setUp(self):
+        for patcher in (
+            mock.patch.object(answer_cache, "SentenceTransformer", None),
+            mock.patch.object(agent, "_answer_cache", AnswerCache()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestWarmAnswers(AnswerCacheTestCase):
+    """Parsing of batched warm-up responses"""
+
+    def test_out_of_order_missing_and_unknown_answers(self):
+        fake = FakeAgent(
+            "Here are the answers.\n"
+            "### Answer 3\nThird answer.\n\n"
+            "### Answer 1\nFirst answer.\n"
+            "### Answer 7\nNot a question we asked.\n"
+            "### Answer 2\n   \n"
+        )
+
+        answers = agent.warm_answers(["q1", "q2", "q3", "q4"], agent=fake)
+
+        self.assertEqual(answers, {"q1": "First answer.", "q3": "Third answer."})
+        self.assertEqual(agent.get_cached_answer("q3"), "Third answer.")
+        self.assertIsNone(agent.get_cached_answer("q2"))
+        self.assertIsNone(agent.get_cached_answer("q4"))
+
+    def test_only_uncached_questions_are_sent(self):
+        agent._answer_cache.put("q1", "cached")
+        fake = FakeAgent("### Answer 1\nSecond answer.")
+
+        answers = agent.warm_answers(["q1", "q2"], agent=fake)
+
+        self.assertEqual(answers, {"q2": "Second answer."})
+        self.assertIn("1. q2", fake.prompts[0])
+        self.assertNotIn("q1", fake.prompts[0])
+
+    def test_unparseable_response_caches_nothing(self):
+        answers = agent.warm_answers(["q1"], agent=FakeAgent("Sorry, I cannot do that."))
+
+        self.assertEqual(answers, {})
+        self.assertIsNone(agent.get_cached_answer("q1"))
+
+
+class TestAskAgentStream(AnswerCacheTestCase):
+    """Streaming shows every step but caches only the final answer"""
+
+    def test_caches_final_step_only(self):
+        fake = FakeAgent(stream_items=[
+            (AIMessageChunk(content="Let me look "), {"langgraph_step": 1}),
+            (AIMessageChunk(content="that up."), {"langgraph_step": 1}),
+            (AIMessageChunk(
+                content="",
+                tool_call_chunks=[{"name": "list", "args": "{}", "id": "1", "index": 0}]
+            ), {"langgraph_step": 1}),
+            (ToolMessage(content="orders, customers", tool_call_id="1"), {"langgraph_step": 2}),
+            (AIMessageChunk(content="We have "), {"langgraph_step": 3}),
+            (AIMessageChunk(content="two tables."), {"langgraph_step": 3}),
+        ])
+
+        streamed = "".join(agent.ask_agent_stream("What tables?", agent=fake))
+
+        self.assertEqual(streamed, "Let me look that up.\n\nWe have two tables.")
+        self.assertEqual(agent.get_cached_answer("What tables?"), "We have two tables.")
+
+    def test_cache_hit_skips_agent(self):
+        agent._answer_cache.put("What tables?", "cached answer")
+        fake = FakeAgent()
+
+        self.assertEqual(list(agent.ask_agent_stream("What tables?", agent=fake)), ["cached answer"])
+        self.assertEqual(fake.prompts, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Test Agent Answer Cache
+
+Offline unit tests for AnswerCache: exact matching, LRU eviction, TTL
+expiry and semantic matching (with a stand-in embedding model).
+"""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from agents import answer_cache
+from agents.answer_cache import AnswerCache
+
+
+class FakeEmbeddingModel:
+    """Stand-in for SentenceTransformer with fixed unit vectors per text"""
+
+    VECTORS = {
+        "what tables do we have?": [1.0, 0.0, 0.0],
+        "which tables do we have?": [0.99, 0.141, 0.0],
+        "describe dim_customers": [0.0, 1.0, 0.0],
+        "describe dim_orders": [0.0, 0.999, 0.045],
+        "how is revenue calculated?": [0.0, 0.0, 1.0],
+    }
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def encode(self, text: str, normalize_embeddings: bool = True):
+        vector = np.array(self.VECTORS.get(text, [0.577, 0.577, 0.577]))
+        return vector / np.linalg.norm(vector)
+
+
+class TestExactMatching(unittest.TestCase):
+    """Exact matching and eviction, without sentence-transformers"""
+
+    def setUp(self):
+        patcher = mock.patch.object(answer_cache, "SentenceTransformer", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_normalizes_case_and_whitespace(self):
+        cache = AnswerCache()
+        cache.put("What tables  do we have?", "orders, customers")
+
+        self.assertEqual(cache.get("  what TABLES do we have? "), "orders, customers")
+        self.assertIsNone(cache.get("What tables do we need?"))
+
+    def test_evicts_least_recently_used(self):
+        cache = AnswerCache(max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+        self.assertEqual(len(cache), 2)
+
+    def test_entries_expire_after_ttl(self):
+        cache = AnswerCache(ttl=60)
+
+        with mock.patch.object(answer_cache.time, "monotonic", return_value=1000.0):
+            cache.put("a", "1")
+        with mock.patch.object(answer_cache.time, "monotonic", return_value=1059.0):
+            self.assertEqual(cache.get("a"), "1")
+        with mock.patch.object(answer_cache.time, "monotonic", return_value=1061.0):
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(len(cache), 0)
+
+    def test_no_ttl_keeps_entries(self):
+        cache = AnswerCache(ttl=None)
+
+        with mock.patch.object(answer_cache.time, "monotonic", return_value=0.0):
+            cache.put("a", "1")
+        with mock.patch.object(answer_cache.time, "monotonic", return_value=1e9):
+            self.assertEqual(cache.get("a"), "1")
+
+    def test_clear(self):
+        cache = AnswerCache()
+        cache.put("a", "1")
+        cache.clear()
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+
+class TestSemanticMatching(unittest.TestCase):
+    """Similarity matching with a stand-in embedding model"""
+
+    def setUp(self):
+        patcher = mock.patch.object(answer_cache, "SentenceTransformer", FakeEmbeddingModel)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_matches_reworded_question(self):
+        cache = AnswerCache()
+        cache.put("What tables do we have?", "orders, customers")
+
+        self.assertTrue(cache.semantic)
+        self.assertEqual(cache.get("Which tables do we have?"), "orders, customers")
+
+    def test_rejects_dissimilar_question(self):
+        cache = AnswerCache()
+        cache.put("What tables do we have?", "orders, customers")
+
+        self.assertIsNone(cache.get("How is revenue calculated?"))
+
+    def test_requires_same_identifiers(self):
+        cache = AnswerCache()
+        cache.put("Describe dim_customers", "customer columns")
+
+        # Nearly identical embeddings, but a different table
+        self.assertIsNone(cache.get("Describe dim_orders"))
+        self.assertEqual(cache.get("describe dim_customers"), "customer columns")
+
+    def test_model_failure_falls_back_to_exact_matching(self):
+        load = mock.Mock(side_effect=OSError("no network"))
+
+        with mock.patch.object(answer_cache, "SentenceTransformer", load):
+            cache = AnswerCache()
+            with self.assertLogs(answer_cache.logger, "WARNING"):
+                cache.put("What tables do we have?", "orders, customers")
+
+            self.assertFalse(cache.semantic)
+            self.assertEqual(cache.get("what tables do we have?"), "orders, customers")
+            self.assertIsNone(cache.get("Which tables do we have?"))
+            cache.put("How is revenue calculated?", "sum of amount")
+
+        # Loading was attempted once, not on every call
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_identifiers(self):
+        self.assertEqual(
+            AnswerCache._identifiers("describe analytics.orders and fct_sales_2024 in v2"),
+            frozenset({"analytics.orders", "fct_sales_2024", "v2"})
+        )
+        self.assertEqual(AnswerCache._identifiers("what tables do we have?"), frozenset())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,12 +5,43 @@ Validates the connection to DBT MCP Server and tests basic functionality.
 """
 
 import asyncio
+import logging
 import sys
-from typing import Any
+from typing import Any, List, Optional
 
 from agents.mcp_client import get_mcp_client, close_global_client
 
 
+# Name keywords for picking a tool to test, in priority order
+TEST_TOOL_KEYWORDS = (("discovery", "list"), ("model",))
+
+
+def find_test_tool(tools: List[Any]) -> Optional[str]:
+    """
+    Pick a tool to exercise in the connection test
+
+    Prefers discovery/list tools, then model tools, then the first tool.
+
+    Args:
+        tools: Tools returned by the MCP Server
+
+    Returns:
+        Name of the tool to test, or None if there are no tools
+    """
+    # Lower-case each name once, then stop at the first match
+    tool_map = {tool.name.lower(): tool.name for tool in tools}
+
+    return next(
+        (
+            name
+            for keywords in TEST_TOOL_KEYWORDS
+            for key, name in tool_map.items()
+            if any(keyword in key for keyword in keywords)
+        ),
+        tools[0].name if tools else None
+    )
+
+
 async def test_connection() -> None:
     """
     Test the MCP Server connection
@@ -50,42 +81,28 @@ async def test_connection() -> None:
             print("No tools available from MCP Server")
             return
 
-        print(f"\nFound {len(tools)} tools:\n")
+        # Build the listing once and write it in a single call
+        lines = [f"\nFound {len(tools)} tools:\n"]
         for idx, tool in enumerate(tools, 1):
-            print(f"{idx:2d}. {tool.name}")
+            lines.append(f"{idx:2d}. {tool.name}")
             if tool.description:
                 # Indent description
-                desc_lines = tool.description.split('\n')
-                for line in desc_lines:
-                    if line.strip():
-                        print(f"     {line}")
-            print()
+                lines.extend(
+                    f"     {line}"
+                    for line in tool.description.split('\n')
+                    if line.strip()
+                )
+            lines.append("")
+        print("\n".join(lines))
 
         # Step 3: Test a tool call
         print("\n[3/4] Testing tool call...")
         print("-" * 80)
 
         # Try to find a discovery or list tool to test
-        test_tool = None
+        test_tool = find_test_tool(tools)
         test_args = {}
 
-        # Look for discovery-related tools first
-        for tool in tools:
-            if 'discovery' in tool.name.lower() or 'list' in tool.name.lower():
-                test_tool = tool.name
-                break
-
-        # If no discovery tool, try models-related tools
-        if not test_tool:
-            for tool in tools:
-                if 'model' in tool.name.lower():
-                    test_tool = tool.name
-                    break
-
-        # Fallback to first available tool
-        if not test_tool and tools:
-            test_tool = tools[0].name
-
         if test_tool:
             print(f"\nTesting tool: {test_tool}")
             print(f"Arguments: {test_args if test_args else 'None'}\n")
@@ -174,6 +191,7 @@ if __name__ == "__main__":
         python test_mcp.py              # Run full connection test
         python test_mcp.py <tool_name>  # Test specific tool
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
     if len(sys.argv) > 1:
         # Test specific tool
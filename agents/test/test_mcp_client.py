@@ -0,0 +1,251 @@
+"""
+Test MCP Client Helpers
+
+Offline unit tests for the MCP client's event-loop bridge, caches and
+connection handling. No MCP Server is started.
+"""
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from mcp.types import Tool
+
+from agents import mcp_client
+
+
+class TestRunSync(unittest.TestCase):
+    """run_sync drives coroutines on the background MCP loop"""
+
+    def test_returns_result_from_loop_thread(self):
+        async def current_thread_name():
+            return mcp_client.threading.current_thread().name
+
+        self.assertEqual(mcp_client.run_sync(current_thread_name()), "mcp-event-loop")
+
+    def test_propagates_exceptions(self):
+        async def fail():
+            raise ValueError("boom")
+
+        with self.assertRaisesRegex(ValueError, "boom"):
+            mcp_client.run_sync(fail())
+
+    def test_timeout_cancels_coroutine(self):
+        cancelled = mcp_client.threading.Event()
+
+        async def hang():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with self.assertRaises(TimeoutError):
+            mcp_client.run_sync(hang(), timeout=0.05)
+
+        self.assertTrue(cancelled.wait(timeout=5))
+
+    def test_rejects_calls_from_loop_thread(self):
+        async def inner():
+            return 1
+
+        async def outer():
+            return mcp_client.run_sync(inner())
+
+        with self.assertRaisesRegex(RuntimeError, "MCP event loop"):
+            mcp_client.run_sync(outer(), timeout=5)
+
+
+class TestRunAll(unittest.TestCase):
+    """run_all gathers results in order, bounded and with per-call timeouts"""
+
+    def test_results_and_errors_in_input_order(self):
+        async def value(i: int):
+            await asyncio.sleep(0.01 * (3 - i))
+            if i == 1:
+                raise ValueError(f"bad {i}")
+            return i
+
+        results = mcp_client.run_sync(
+            mcp_client.run_all([value(i) for i in range(3)], concurrency=3),
+            timeout=5
+        )
+
+        self.assertEqual(results[0], 0)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], 2)
+
+    def test_timeout_applies_per_coroutine(self):
+        async def sleep(seconds: float):
+            await asyncio.sleep(seconds)
+            return seconds
+
+        results = mcp_client.run_sync(
+            mcp_client.run_all([sleep(0.01), sleep(60), sleep(0.01)], concurrency=3, timeout=0.1),
+            timeout=5
+        )
+
+        self.assertEqual(results[0], 0.01)
+        self.assertIsInstance(results[1], asyncio.TimeoutError)
+        self.assertEqual(results[2], 0.01)
+
+    def test_concurrency_limit(self):
+        running = 0
+        peak = 0
+
+        async def track():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        mcp_client.run_sync(mcp_client.run_all([track() for _ in range(6)], concurrency=2), timeout=5)
+
+        self.assertEqual(peak, 2)
+
+
+class TestToolsCache(unittest.TestCase):
+    """Tool lists are cached in memory and on disk for TOOLS_CACHE_TTL"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        patcher = mock.patch.object(mcp_client, "TOOLS_CACHE_FILE", Path(tmp.name) / "tools.json")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        mcp_client.invalidate_tools_cache()
+        self.addCleanup(mcp_client.invalidate_tools_cache)
+
+        self.tools = [Tool(
+            name="get_model_details",
+            description="Get details for a model",
+            inputSchema={"type": "object", "properties": {"name": {"type": "string"}}},
+        )]
+
+    def _store(self, fetched_at: float) -> None:
+        key = mcp_client.SERVER_PARAMS_KEY
+        mcp_client._tools_cache[key] = self.tools
+        mcp_client._tools_cache_ts[key] = fetched_at
+        mcp_client._write_tools_cache_file(key, self.tools, fetched_at)
+
+    def test_disk_round_trip(self):
+        self._store(fetched_at=1000.0)
+        mcp_client.invalidate_tools_cache()
+
+        with mock.patch.object(mcp_client.time, "time", return_value=1001.0):
+            self.assertIsNone(mcp_client.get_cached_tools(persistent=False))
+            tools = mcp_client.get_cached_tools()
+
+        self.assertEqual(tools, self.tools)
+        # The disk hit repopulates the in-memory cache
+        with mock.patch.object(mcp_client.time, "time", return_value=1001.0):
+            self.assertEqual(mcp_client.get_cached_tools(persistent=False), self.tools)
+
+    def test_entries_expire_after_ttl(self):
+        ttl = mcp_client.TOOLS_CACHE_TTL
+        self._store(fetched_at=1000.0)
+
+        with mock.patch.object(mcp_client.time, "time", return_value=1000.0 + ttl - 1):
+            self.assertEqual(mcp_client.get_cached_tools(), self.tools)
+        with mock.patch.object(mcp_client.time, "time", return_value=1000.0 + ttl):
+            self.assertIsNone(mcp_client.get_cached_tools())
+
+    def test_unreadable_file_is_a_miss(self):
+        mcp_client.TOOLS_CACHE_FILE.write_text("not json", encoding="utf-8")
+
+        self.assertIsNone(mcp_client.get_cached_tools())
+
+    def test_persistent_invalidate_deletes_file(self):
+        self._store(fetched_at=1000.0)
+        mcp_client.invalidate_tools_cache(persistent=True)
+
+        self.assertFalse(mcp_client.TOOLS_CACHE_FILE.exists())
+        with mock.patch.object(mcp_client.time, "time", return_value=1001.0):
+            self.assertIsNone(mcp_client.get_cached_tools())
+
+
+class TestToolResultCache(unittest.TestCase):
+    """Tool call results expire after TOOL_RESULT_CACHE_TTL and are bounded"""
+
+    def setUp(self):
+        mcp_client.invalidate_tool_results()
+        self.addCleanup(mcp_client.invalidate_tool_results)
+
+    def test_entries_expire_after_ttl(self):
+        ttl = mcp_client.TOOL_RESULT_CACHE_TTL
+
+        with mock.patch.object(mcp_client.time, "time", return_value=1000.0):
+            mcp_client.cache_tool_result("list_models", "{}", "orders")
+        with mock.patch.object(mcp_client.time, "time", return_value=1000.0 + ttl - 1):
+            self.assertEqual(mcp_client.get_cached_tool_result("list_models", "{}"), "orders")
+        with mock.patch.object(mcp_client.time, "time", return_value=1000.0 + ttl):
+            self.assertIsNone(mcp_client.get_cached_tool_result("list_models", "{}"))
+
+        self.assertEqual(len(mcp_client._tool_result_cache), 0)
+
+    def test_keyed_by_tool_and_arguments(self):
+        mcp_client.cache_tool_result("get_model_details", '{"name": "orders"}', "orders")
+
+        self.assertIsNone(mcp_client.get_cached_tool_result("get_model_details", '{"name": "customers"}'))
+        self.assertIsNone(mcp_client.get_cached_tool_result("get_model_parents", '{"name": "orders"}'))
+
+    def test_evicts_least_recently_used(self):
+        with mock.patch.object(mcp_client, "TOOL_RESULT_CACHE_SIZE", 2):
+            mcp_client.cache_tool_result("a", "{}", "1")
+            mcp_client.cache_tool_result("b", "{}", "2")
+            mcp_client.get_cached_tool_result("a", "{}")
+            mcp_client.cache_tool_result("c", "{}", "3")
+
+        self.assertEqual(mcp_client.get_cached_tool_result("a", "{}"), "1")
+        self.assertIsNone(mcp_client.get_cached_tool_result("b", "{}"))
+        self.assertEqual(mcp_client.get_cached_tool_result("c", "{}"), "3")
+
+
+
+class TestConnectCoalescing(unittest.TestCase):
+    """Concurrent connects share a single server start"""
+
+    def setUp(self):
+        self.opened = 0
+
+        async def fake_open_session(client: mcp_client.DBTMCPClient) -> None:
+            self.opened += 1
+            await asyncio.sleep(0.05)
+            client._connected = True
+
+        patcher = mock.patch.object(mcp_client.DBTMCPClient, "_open_session", fake_open_session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_concurrent_connect_opens_one_session(self):
+        client = mcp_client.DBTMCPClient()
+
+        async def connect_many():
+            await asyncio.gather(*[client.connect() for _ in range(5)])
+
+        mcp_client.run_sync(connect_many(), timeout=5)
+
+        self.assertEqual(self.opened, 1)
+        self.assertTrue(client.is_connected)
+
+    def test_concurrent_get_mcp_client_shares_one_instance(self):
+        patcher = mock.patch.object(mcp_client, "_client_instance", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        async def get_many():
+            return await asyncio.gather(*[mcp_client.get_mcp_client() for _ in range(5)])
+
+        clients = mcp_client.run_sync(get_many(), timeout=5)
+
+        self.assertEqual(self.opened, 1)
+        self.assertTrue(all(client is clients[0] for client in clients))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,8 +6,22 @@ Uses LangChain Agent to automatically discover and query data assets
 """
 
 import streamlit as st
+import concurrent.futures
+import json
+import logging
 import os
-from agents.agent import ask_agent
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+from dotenv import load_dotenv
+
+# Heavy agent dependencies are loaded on first use
+import agents
+
+logger = logging.getLogger(__name__)
 
 # ============================================================================
 # Page Configuration
@@ -30,21 +44,71 @@ st.caption("Intelligent Query Based on DBT Metadata")
 # Check Environment Configuration
 # ============================================================================
 
+
+@st.cache_resource(show_spinner=False)
+def load_env() -> bool:
+    """Load environment variables from the .env file once per app process"""
+    return load_dotenv()
+
+
+# Load environment variables from .env file
+load_env()
+
 # Check if OPENAI_API_KEY is set
 if not os.getenv("OPENAI_API_KEY"):
     st.error("⚠️ OPENAI_API_KEY is not set. Please configure the API key in your .env file.")
     st.stop()
 
 # ============================================================================
-# Initialize Session State
+# Agent
 # ============================================================================
 
-# Initialize chat history
-if "messages" not in st.session_state:
-    st.session_state.messages = []
 
-    # Add welcome message
-    welcome_message = """👋 Hello! I'm your Data Asset Discovery Assistant.
+def _warm_up_agent(future: concurrent.futures.Future) -> None:
+    """Start the MCP Server and build the agent ahead of the first question"""
+    try:
+        # The agent module's timeout, so warm-up and agent build agree
+        agents.run_sync(agents.get_mcp_client(), timeout=agents.MCP_CONNECT_TIMEOUT)
+        agents.get_agent()
+    except Exception as e:
+        logger.warning("Agent warm-up failed: %s", e)
+        future.set_exception(e)
+    else:
+        future.set_result(None)
+
+
+@st.cache_resource(show_spinner=False)
+def start_agent_warm_up() -> concurrent.futures.Future:
+    """Warm up the MCP connection and agent once per app process"""
+    future = concurrent.futures.Future()
+    threading.Thread(
+        target=_warm_up_agent,
+        args=(future,),
+        name="agent-warm-up",
+        daemon=True
+    ).start()
+    return future
+
+
+# Connect and build in the background so the page paints immediately;
+# a question asked before this finishes waits for it in get_agent()
+warm_up = start_agent_warm_up()
+
+if warm_up.done() and warm_up.exception() is not None:
+    # Drop the failed warm-up so the next rerun tries again
+    start_agent_warm_up.clear()
+    st.error(f"⚠️ Failed to initialize the agent: {str(warm_up.exception())}")
+    st.stop()
+
+
+# ============================================================================
+# Static Content
+# ============================================================================
+
+# Defined once at import instead of being rebuilt on every rerun
+
+# Assistant greeting shown at the top of a new conversation
+WELCOME_MESSAGE = """👋 Hello! I'm your Data Asset Discovery Assistant.
 
 I can help you:
 - Find tables and models in your DBT project
@@ -53,121 +117,153 @@ I can help you:
 
 Try asking me a question, or click on the examples in the sidebar!"""
 
-    st.session_state.messages.append({
-        "role": "assistant",
-        "content": welcome_message
-    })
+# Example questions offered in the sidebar
+EXAMPLE_QUESTIONS = (
+    "What tables do we have?",
+    "Are there any order-related tables?",
+    "Describe the structure of the dim_customers table in detail",
+    "Which tables contain customer information?",
+    "Tell me about tables related to sales data",
+    "List all dimension tables"
+)
+
+# Widget keys for the example buttons, indexed so they never collide
+EXAMPLE_KEYS = tuple(f"example_{i}" for i in range(len(EXAMPLE_QUESTIONS)))
+
+# Minimum seconds between example warm-ups in one app process; a retry
+# after a failure or expired answers costs at most one batch per interval
+EXAMPLE_WARM_UP_INTERVAL = 600
+
+# Sidebar About section
+ABOUT_MD = """
+**GenBI POC - Phase 1**
+
+Technologies Used:
+- DBT (Data Build Tool)
+- LangChain & LangGraph
+- OpenAI GPT-4o-mini
+- MCP (Model Context Protocol)
+- Streamlit
+
+Features: Intelligent data asset discovery and querying
+"""
 
 # ============================================================================
-# Sidebar - Example Questions and Features
+# Chat History
 # ============================================================================
 
-with st.sidebar:
-    st.header("💡 Try These Questions")
+# Messages kept in session state; older ones are spilled to disk
+MAX_MESSAGES_IN_MEMORY = 20
 
-    # Example questions list
-    example_questions = [
-        "What tables do we have?",
-        "Are there any order-related tables?",
-        "Describe the structure of the dim_customers table in detail",
-        "Which tables contain customer information?",
-        "Tell me about tables related to sales data",
-        "List all dimension tables"
-    ]
-
-    # Create button for each example
-    for question in example_questions:
-        if st.button(question, key=f"example_{question}", use_container_width=True):
-            # Process example question as user input
-            # Add user message
-            st.session_state.messages.append({
-                "role": "user",
-                "content": question
-            })
-
-            # Call Agent to get response
-            with st.spinner("🤔 Thinking..."):
-                try:
-                    response = ask_agent(question)
-
-                    # Add assistant response
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": response
-                    })
-                except Exception as e:
-                    # Error handling
-                    error_message = f"Sorry, an error occurred while processing your question: {str(e)}"
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": error_message
-                    })
-
-            # Refresh page to display new messages
-            st.rerun()
+# Directory for per-session spilled history files
+HISTORY_DIR = Path(tempfile.gettempdir()) / "genbi_chat_history"
 
-    # Divider
-    st.sidebar.divider()
+# Spilled history untouched for this long belongs to an ended session (seconds)
+HISTORY_MAX_AGE = 24 * 3600
 
-    # Clear conversation button
-    if st.button("🗑️ Clear Conversation", use_container_width=True):
-        # Clear message history
-        st.session_state.messages = []
+# The temp directory is shared with other users, so spilled conversations
+# are readable by the app's user only
+HISTORY_DIR_MODE = 0o700
+HISTORY_FILE_MODE = 0o600
 
-        # Re-add welcome message
-        welcome_message = """👋 Hello! I'm your Data Asset Discovery Assistant.
 
-I can help you:
-- Find tables and models in your DBT project
-- Understand table field structures and meanings
-- Explore data assets
+def _history_file() -> Path:
+    """Get the spill file for the current session"""
+    return HISTORY_DIR / f"{st.session_state.session_id}.jsonl"
 
-Try asking me a question, or click on the examples in the sidebar!"""
 
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": welcome_message
-        })
+def add_message(role: str, content: str) -> None:
+    """
+    Append a message to the chat history
 
-        # Refresh page
-        st.rerun()
+    Once more than MAX_MESSAGES_IN_MEMORY messages are held, the oldest
+    are moved to the session's history file. If the file cannot be
+    written they simply stay in memory.
 
-    # About section
-    st.sidebar.divider()
-    st.sidebar.markdown("### About")
-    st.sidebar.info("""
-    **GenBI POC - Phase 1**
+    Args:
+        role: "user" or "assistant"
+        content: Message text
+    """
+    messages = st.session_state.messages
+    messages.append({"role": role, "content": content})
+
+    overflow = len(messages) - MAX_MESSAGES_IN_MEMORY
+    if overflow <= 0:
+        return
+
+    try:
+        HISTORY_DIR.mkdir(mode=HISTORY_DIR_MODE, parents=True, exist_ok=True)
+        # mkdir leaves the mode of an existing directory alone
+        HISTORY_DIR.chmod(HISTORY_DIR_MODE)
+        fd = os.open(_history_file(), os.O_WRONLY | os.O_CREAT | os.O_APPEND, HISTORY_FILE_MODE)
+        with open(fd, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(message) + "\n" for message in messages[:overflow])
+    except OSError as e:
+        logger.warning("Failed to spill chat history to disk: %s", e)
+        return
+
+    st.session_state.messages = messages[overflow:]
+
+
+def load_older_messages() -> List[Dict[str, str]]:
+    """Read the messages spilled to disk, oldest first"""
+    try:
+        with _history_file().open(encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return []
+    except OSError as e:
+        logger.warning("Failed to read spilled chat history: %s", e)
+        return []
+
+
+def clear_history() -> None:
+    """Reset the conversation to the welcome message and drop spilled history"""
+    try:
+        _history_file().unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("Failed to delete spilled chat history: %s", e)
+
+    st.session_state.show_older = False
+    st.session_state.messages = []
+    add_message("assistant", WELCOME_MESSAGE)
 
-    Technologies Used:
-    - DBT (Data Build Tool)
-    - LangChain & LangGraph
-    - OpenAI GPT-4o-mini
-    - MCP (Model Context Protocol)
-    - Streamlit
 
-    Features: Intelligent data asset discovery and querying
-    """)
+def prune_history_files() -> None:
+    """Delete spilled history files left behind by ended sessions"""
+    cutoff = time.time() - HISTORY_MAX_AGE
+    try:
+        for path in HISTORY_DIR.glob("*.jsonl"):
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("Failed to prune chat history files: %s", e)
+
 
 # ============================================================================
-# Display Chat History
+# Initialize Session State
 # ============================================================================
 
-# Iterate and display all messages
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        st.markdown(message["content"])
+# Initialize chat history
+if "messages" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+    prune_history_files()
+    clear_history()
 
 # ============================================================================
-# User Input Processing
+# Message Handling
 # ============================================================================
 
-# Chat input box
-if prompt := st.chat_input("Ask me about data tables..."):
+
+def handle_user_message(prompt: str) -> None:
+    """
+    Record a user message, then stream and record the agent's answer
+
+    Args:
+        prompt: The user's question
+    """
     # Add user message to history
-    st.session_state.messages.append({
-        "role": "user",
-        "content": prompt
-    })
+    add_message("user", prompt)
 
     # Display user message
     with st.chat_message("user"):
@@ -175,23 +271,23 @@ if prompt := st.chat_input("Ask me about data tables..."):
 
     # Call Agent to get response
     with st.chat_message("assistant"):
-        with st.spinner("🤔 Thinking..."):
-            try:
-                # Call Agent
-                response = ask_agent(prompt)
-
-                # Display response
+        try:
+            # A cached answer is shown at once, without the spinner
+            response = agents.get_cached_answer(prompt)
+
+            if response is None:
+                with st.spinner("🤔 Thinking..."):
+                    # Call Agent and display the response as it streams in
+                    response = st.write_stream(agents.ask_agent_stream(prompt))
+            else:
                 st.markdown(response)
 
-                # Add assistant response to history
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": response
-                })
+            # Add assistant response to history
+            add_message("assistant", response)
 
-            except Exception as e:
-                # Error handling
-                error_message = f"""Sorry, an error occurred while processing your question.
+        except Exception as e:
+            # Error handling
+            error_message = f"""Sorry, an error occurred while processing your question.
 
 **Error message:** {str(e)}
 
@@ -206,20 +302,115 @@ You can try:
 - Clear the conversation and try again
 """
 
-                st.error(error_message)
+            st.error(error_message)
+
+            # Add error message to history
+            add_message("assistant", error_message)
+
+
+# ============================================================================
+# Sidebar - Example Questions and Features
+# ============================================================================
+
+
+@st.cache_resource(show_spinner=False, ttl=EXAMPLE_WARM_UP_INTERVAL)
+def start_example_warm_up() -> threading.Thread:
+    """Pre-answer the examples in one batched agent run, off the render path"""
+    thread = threading.Thread(
+        target=agents.warm_answers,
+        args=(EXAMPLE_QUESTIONS,),
+        name="example-warm-up",
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+
+with st.sidebar:
+    st.header("💡 Try These Questions")
+
+    # Shared by all sessions; warm_answers only pays for uncached examples
+    start_example_warm_up()
+
+    # Create button for each example; the question is handled below with
+    # the chat input so the exchange renders in the main chat area
+    selected_question = None
+    for key, question in zip(EXAMPLE_KEYS, EXAMPLE_QUESTIONS):
+        if st.button(question, key=key, use_container_width=True):
+            selected_question = question
+
+    # Divider
+    st.sidebar.divider()
+
+    # Clear conversation button
+    if st.button("🗑️ Clear Conversation", use_container_width=True):
+        # Clear message history, including any spilled to disk
+        clear_history()
+
+        # No rerun needed: the history below is drawn after this point
+
+    # Refresh metadata button; the caches are shared by every session
+    if st.button(
+        "🔄 Refresh Metadata",
+        help="Drop cached answers and tool results after the dbt project changes",
+        use_container_width=True
+    ):
+        # Both tiers, so new answers are not built from stale tool results
+        agents.clear_answer_cache()
+        agents.invalidate_tool_results()
+        st.toast("Cached answers and metadata cleared")
+
+    # About section
+    st.sidebar.divider()
+    st.sidebar.markdown("### About")
+    st.sidebar.info(ABOUT_MD)
+
+# ============================================================================
+# Display Chat History
+# ============================================================================
+
+
+
+@st.fragment
+def render_history() -> None:
+    """Display the recent messages, and older ones from disk on request"""
+    messages = st.session_state.messages
+
+    # Older messages are only read from disk once the user asks for them
+    if _history_file().exists():
+        if st.session_state.show_older:
+            messages = load_older_messages() + messages
+        elif st.button("⬆️ Load older messages"):
+            st.session_state.show_older = True
+            # Rerun the whole app, not just this fragment: the exchange
+            # drawn inline by the last full run would otherwise show twice
+            st.rerun(scope="app")
+
+    for message in messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+
+render_history()
+
+# ============================================================================
+# User Input Processing
+# ============================================================================
 
-                # Add error message to history
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": error_message
-                })
+# Chat input box (an example click from the sidebar is handled the same way).
+# This stays a full-script rerun rather than a fragment: a fragment rerun
+# would not redraw render_history, so the exchange drawn inline here would
+# vanish on the next submission.
+if prompt := st.chat_input("Ask me about data tables...") or selected_question:
+    handle_user_message(prompt)
 
 # ============================================================================
 # Footer
 # ============================================================================
 
-st.markdown("---")
+# Divider and caption sent as one element
 st.markdown(
+    "---\n"
     "<div style='text-align: center; color: gray;'>"
     "Powered by DBT + LangChain + OpenAI | GenBI POC Phase 1"
     "</div>",